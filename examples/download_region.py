@@ -1,10 +1,17 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
 import argparse
+import json
 
 import ee
 
-from utils import OUTPUTS_DIR, run_example  # noqa: F401 isort: skip
+from utils import (  # noqa: F401 isort: skip
+    OUTPUTS_DIR,
+    run_example,
+    scale_type,
+    year_type,
+)
+
 from src import AlphaEarthDownloader  # noqa: F401 isort: skip
 
 
@@ -19,32 +26,46 @@ def parse_args() -> dict:
     )  # --country Turkey
     parser.add_argument(
         "--year",
-        type=int,
+        type=year_type,
         default=2024,
         help="Year to download embeddings for. (default: 2024)",
     )  # --year 2024
     parser.add_argument(
         "--scale",
-        type=int,
+        type=scale_type,
         default=1000,
         help="Spatial resolution in meters. (default: 1000)",
     )  # --scale 1000
     parser.add_argument(
         "--dtype",
-        choices=["uint8", "float32"],
-        default="float32",
-        help="Data type of the output file. (default: float32)",
-    )  # --dtype float32
+        choices=["uint8", "int8", "float32"],
+        default="uint8",
+        help="Data type of the output file. (default: uint8)",
+    )  # --dtype uint8
+
+    return vars(parser.parse_args())
+
 
-    args = vars(parser.parse_args())
+def get_country_geometry(country: str, scale: int) -> ee.Geometry:
+    """
+    Get the geometry of a country, cached locally as GeoJSON.
+    The geometry is simplified to the requested scale to keep requests small.
+    """
+    path = OUTPUTS_DIR / ".cache" / f"{country}_{scale}m.geojson"
+    if path.is_file():
+        with open(path, "r") as f:
+            return ee.Geometry(json.load(f))
+
+    region = ee.FeatureCollection("FAO/GAUL/2015/level0").filter(
+        ee.Filter.eq("ADM0_NAME", country)
+    )
+    geometry = region.geometry().simplify(scale)
 
-    # Validate arguments
-    assert (args["year"] >= 2017) and (
-        args["year"] <= 2024
-    ), "Year must be between 2017 and 2024."
-    assert args["scale"] >= 10, "Scale must be at least 10 meters."
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(geometry.getInfo(), f)
 
-    return args
+    return geometry
 
 
 def main(
@@ -58,10 +79,7 @@ def main(
     downloader = AlphaEarthDownloader(project=project)
 
     # Get country geometry
-    region = ee.FeatureCollection("FAO/GAUL/2015/level0").filter(
-        ee.Filter.eq("ADM0_NAME", country)
-    )
-    geometry = region.geometry()
+    geometry = get_country_geometry(country, scale)
 
     # Download embeddings
     downloader.download_by_region(
@@ -2,7 +2,13 @@
 
 import argparse
 
-from utils import OUTPUTS_DIR, run_example  # noqa: F401 isort: skip
+from utils import (  # noqa: F401 isort: skip
+    OUTPUTS_DIR,
+    run_example,
+    scale_type,
+    year_type,
+)
+
 from src import AlphaEarthDownloader  # noqa: F401 isort: skip
 
 
@@ -42,32 +48,24 @@ def parse_args() -> dict:
     )  # --hemisphere N
     parser.add_argument(
         "--year",
-        type=int,
+        type=year_type,
         default=2024,
         help="Year to download embeddings for. (default: 2024)",
     )  # --start_date 2020-01-01
     parser.add_argument(
         "--scale",
-        type=int,
+        type=scale_type,
         default=1000,
         help="Spatial resolution in meters. (default: 1000)",
     )  # --scale 1000
     parser.add_argument(
         "--dtype",
-        choices=["uint8", "float32"],
-        default="float32",
-        help="Data type of the output file. (default: float32)",
-    )  # --dtype float32
-
-    args = vars(parser.parse_args())
-
-    # Validate arguments
-    assert (args["year"] >= 2017) and (
-        args["year"] <= 2024
-    ), "Year must be between 2017 and 2024."
-    assert args["scale"] >= 10, "Scale must be at least 10 meters."
+        choices=["uint8", "int8", "float32"],
+        default="uint8",
+        help="Data type of the output file. (default: uint8)",
+    )  # --dtype uint8
 
-    return args
+    return vars(parser.parse_args())
 
 
 def main(
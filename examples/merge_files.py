@@ -1,8 +1,11 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
 import argparse
+import os
 from pathlib import Path
 
+import rasterio
+
 from utils import OUTPUTS_DIR, run_example  # noqa: F401 isort: skip
 from src.utils import merge_tif_directory, merge_tif_files  # noqa: F401 isort: skip
 
@@ -30,25 +33,45 @@ def parse_args() -> dict:
         default="directory",
         help="Merging method. (default: directory)",
     )  # --merging-method directory
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=None,
+        help="Number of threads reading the source files. (default: number of CPUs + 4)",
+    )  # --num-workers 8
 
     return vars(parser.parse_args())
 
 
 def main(
-    input_dir: str, output_path: str | None, delete_after: bool, merging_method: str
+    input_dir: str,
+    output_path: str | None,
+    delete_after: bool,
+    merging_method: str,
+    num_workers: int | None,
 ) -> None:
     input_dir: Path = OUTPUTS_DIR / input_dir
     assert input_dir.is_dir() and input_dir.exists(), "Input directory must exist."
     if output_path:
         output_path = OUTPUTS_DIR / output_path
 
-    if merging_method == "directory":
-        merge_tif_directory(input_dir, output_path, delete_after)
-    else:
-        if not output_path:
-            raise ValueError("Output path is required when merging files.")
-        files = list(input_dir.glob("*.tif"))
-        merge_tif_files(files, output_path, delete_after)
+    # The files are read in parallel by the merge functions themselves
+    with rasterio.Env(GDAL_CACHEMAX=512):
+        if merging_method == "directory":
+            merge_tif_directory(
+                input_dir, output_path, delete_after, num_workers=num_workers
+            )
+        else:
+            if not output_path:
+                raise ValueError("Output path is required when merging files.")
+            # DirEntry caches the file type, so no stat() call is needed per file
+            with os.scandir(input_dir) as entries:
+                files = [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".tif") and entry.is_file()
+                ]
+            merge_tif_files(files, output_path, delete_after, num_workers=num_workers)
 
 
 if __name__ == "__main__":
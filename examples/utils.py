@@ -1,5 +1,7 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
+import argparse
+import os
 import shutil
 import sys
 from contextlib import contextmanager
@@ -9,6 +11,12 @@ from typing import Generator
 ROOT_DIR = Path(__file__).parents[1]
 OUTPUTS_DIR = ROOT_DIR / "outputs"
 
+# Years covered by the AlphaEarth annual collection
+YEAR_RANGE = range(2017, 2025)
+
+# Directories skipped when cleaning up the project
+SKIP_DIRS = {OUTPUTS_DIR.name, ".git", ".venv", "node_modules"}
+
 sys.path.append(str(ROOT_DIR))
 OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -17,9 +25,35 @@ def remove_pycache() -> None:
     """
     Remove all __pycache__ directories in the project.
     """
-    for path in ROOT_DIR.rglob("__pycache__"):
-        if path.is_dir():
-            shutil.rmtree(path)
+    for dirpath, dirnames, _ in os.walk(ROOT_DIR, topdown=True):
+        # Do not descend into the outputs or environment directories
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+
+        if "__pycache__" in dirnames:
+            shutil.rmtree(os.path.join(dirpath, "__pycache__"))
+            dirnames.remove("__pycache__")
+
+
+def year_type(value: str) -> int:
+    """
+    Parse a year covered by the AlphaEarth collection (argparse type).
+    """
+    year = int(value)
+    if year not in YEAR_RANGE:
+        raise argparse.ArgumentTypeError(
+            f"Year must be between {YEAR_RANGE[0]} and {YEAR_RANGE[-1]}."
+        )
+    return year
+
+
+def scale_type(value: str) -> int:
+    """
+    Parse a spatial resolution in meters (argparse type).
+    """
+    scale = int(value)
+    if scale < 10:
+        raise argparse.ArgumentTypeError("Scale must be at least 10 meters.")
+    return scale
 
 
 @contextmanager
@@ -39,6 +73,9 @@ def run_example() -> Generator[None, None, None]:
 __all__ = [
     "ROOT_DIR",
     "OUTPUTS_DIR",
+    "YEAR_RANGE",
     "remove_pycache",
+    "year_type",
+    "scale_type",
     "run_example",
 ]
@@ -3,8 +3,8 @@
 import os
 import warnings
 
-# Suppress warnings
-warnings.filterwarnings("ignore")
+# Suppress warnings of the noisy third-party modules
+warnings.filterwarnings("ignore", module=r"(geemap|ee|urllib3|google)(\.|$)")
 
 # Suppress GDAL loggers
 os.environ["CPL_LOG"] = "/dev/null"  # disable GDAL’s own log file
@@ -13,8 +13,21 @@ os.environ["GDAL_PAM_ENABLED"] = "NO"  # optional: stop GDAL auxiliary writes
 
 # Import the modules
 from . import utils
-from .downloader import AlphaEarthDownloader
-from .visualizer import EarthEngineVisualizer
+
+
+def __getattr__(name: str):
+    # The downloader and the visualizer pull in Earth Engine, rasterio and the mapping
+    # stack, so they are imported lazily (utils can be used without them)
+    if name == "AlphaEarthDownloader":
+        from .downloader import AlphaEarthDownloader
+
+        return AlphaEarthDownloader
+    if name == "EarthEngineVisualizer":
+        from .visualizer import EarthEngineVisualizer
+
+        return EarthEngineVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "utils",
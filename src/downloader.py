@@ -1,16 +1,34 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
-from datetime import datetime
+import hashlib
+import json
+import math
+import os
+import random
+import shutil
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import cached_property
 from pathlib import Path
-from typing import Literal
+from types import MappingProxyType
+from typing import Iterable, Iterator, Literal
 
 import ee
-import geemap
 import numpy as np
+import rasterio
+import requests
+from rasterio.crs import CRS
+from rasterio.transform import Affine, from_origin
+from rasterio.windows import Window
 from tqdm import tqdm
 
-from .earthengine import EarthEngine
-from .utils import quantize_ee
+from .earthengine import HIGH_VOLUME_URL, EarthEngine
+from .utils import convert_to_cog, quantize_ee, stack_tif_files
+
+# HTTP session shared by all downloads, so connections are kept alive and reused
+_SESSION = requests.Session()
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=64))
 
 
 class AlphaEarthDownloader(EarthEngine):
@@ -20,9 +38,60 @@ class AlphaEarthDownloader(EarthEngine):
 
     DATASET_ID = "GOOGLE/SATELLITE_EMBEDDING/V1/ANNUAL"
     NUM_BANDS = 64
-    BAND_NAMES = [f"A{i:02d}" for i in range(NUM_BANDS)]
+    BAND_NAMES = tuple(f"A{i:02d}" for i in range(NUM_BANDS))
+    DTYPE_BYTES = {"uint8": 1, "int8": 1, "float32": 4}
+
+    # Download requests are capped at 32 MB and 10000 pixels per dimension
+    MAX_REQUEST_BYTES = 30 * 1024 * 1024
+    MAX_REQUEST_DIMENSION = 10000
+
+    # Pixel requests are capped at 48 MB
+    MAX_PIXELS_BYTES = 46 * 1024 * 1024
+    METERS_PER_DEGREE = 111320
+
+    # Retry policy for throttled and transient download failures
+    MAX_RETRIES = 6
+    REQUEST_TIMEOUT = 300
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    TRANSIENT_ERRORS = ("too many requests", "quota", "rate limit", "internal error")
+
+    # Downloads are streamed to disk in chunks instead of buffered in memory
+    STREAM_CHUNK_BYTES = 1024 * 1024
+
+    # Bands are downloaded in chunks to keep the requests small
+    BAND_CHUNK_SIZE = 16
+
+    # Dataset information (read-only, see get_info)
+    INFO = MappingProxyType(
+        {
+            "dataset_id": DATASET_ID,
+            "num_bands": NUM_BANDS,
+            "band_names": BAND_NAMES,
+            "resolution": "10m",
+            "temporal_coverage": "2017-2024 (annual)",
+            "coordinate_system": "UTM (native), WGS84 supported",
+            "band_range": "-1 to 1 (unit vectors)",
+            "license": "CC-BY 4.0",
+        }
+    )
+
+    # Number of tiles downloaded in parallel
+    NUM_WORKERS = int(os.environ.get("AE_WORKERS", 25))
 
-    def __init__(self, project: str | None = None, authenticate: bool = True) -> None:
+    # Lifetime of the metadata cached on disk (new images are published over time)
+    CACHE_TTL = 7 * 24 * 60 * 60  # 1 week (seconds)
+
+    def __init__(
+        self,
+        project: str | None = None,
+        authenticate: bool = True,
+        endpoint: str | None = HIGH_VOLUME_URL,
+        cache_dir: str | Path | None = None,
+        compression: Literal["none", "deflate", "lzw", "zstd"] = "zstd",
+        predictor: Literal[1, 2, 3] | None = None,
+        blocksize: int = 512,
+        cache_ttl: float | None = CACHE_TTL,
+    ) -> None:
         """
         Initialize the downloader.
 
@@ -32,11 +101,45 @@ class AlphaEarthDownloader(EarthEngine):
             Google Cloud project ID (required for Earth Engine access).
         authenticate:
             Whether to authenticate with Earth Engine.
+        endpoint:
+            Earth Engine API endpoint (default: high-volume endpoint).
+            If None, the standard endpoint will be used.
+        cache_dir:
+            Directory to cache the collection metadata (asset IDs, bounds and dates)
+            across runs. If None, the metadata is only cached in memory.
+            Use clear_cache to invalidate the cached entries.
+        compression:
+            Compression method of the output files (default: zstd).
+        predictor:
+            TIFF predictor of the output files (1: none, 2: horizontal, 3: floating point).
+            If None, the predictor is chosen from the data type.
+        blocksize:
+            Size of the internal tiles of the output files in pixels.
+        cache_ttl:
+            Lifetime of the metadata cached on disk in seconds (default: 1 week).
+            If None, the cached entries never expire.
         """
-        EarthEngine.__init__(self, project, authenticate)
+        EarthEngine.__init__(self, project, authenticate, url=endpoint)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.cache_ttl = cache_ttl
+        self.cog_options = {
+            "compress": compression.upper(),
+            "predictor": predictor,
+            "blocksize": blocksize,
+        }
+
+        # Output paths of the tiles downloaded by this instance
+        self._seen: dict[tuple, list[Path]] = {}
 
-        # Initialize the collection
-        self.collection = ee.ImageCollection(self.DATASET_ID)
+        # Metadata requested by this instance (see _read_cache)
+        self._memory_cache: dict[str, list | tuple] = {}
+
+    @cached_property
+    def collection(self) -> ee.ImageCollection:
+        """
+        AlphaEarth image collection (created on first access).
+        """
+        return ee.ImageCollection(self.DATASET_ID)
 
     def download_by_region(
         self,
@@ -46,8 +149,12 @@ class AlphaEarthDownloader(EarthEngine):
         region: ee.FeatureCollection | ee.Geometry,
         scale: int = 10,
         bands: list[str] | None = None,
-        dtype: Literal["uint8", "float32"] = "float32",
+        dtype: Literal["uint8", "int8", "float32"] = "float32",
+        num_workers: int | None = None,
+        single_file: bool = False,
+        output_format: Literal["geotiff", "zarr"] = "geotiff",
         prefix: str = "",
+        clip: bool = True,
     ) -> ee.Image | dict:
         """
         Download AlphaEarth embeddings for a region.
@@ -67,8 +174,18 @@ class AlphaEarthDownloader(EarthEngine):
             List of band names to download (default: all 64 bands).
         dtype:
             Data type of the output file (default: uint8).
+        num_workers:
+            Number of tiles downloaded in parallel (default: AE_WORKERS or 25).
+        single_file:
+            Whether to stream the tiles of each image into a single file
+            instead of writing one file per tile.
+        output_format:
+            Format of the output files (default: geotiff). With zarr,
+            every image is streamed into a single Zarr store.
         prefix:
             Prefix to add to the output filename/s.
+        clip:
+            Whether to mask the pixels outside the region (default: True).
 
         Returns
         -------
@@ -90,7 +207,11 @@ class AlphaEarthDownloader(EarthEngine):
             bands=bands,
             crs="EPSG:4326",
             dtype=dtype,
+            num_workers=num_workers,
+            single_file=single_file,
+            output_format=output_format,
             prefix=prefix,
+            clip=clip,
         )
 
     def download_by_latlon(
@@ -104,7 +225,11 @@ class AlphaEarthDownloader(EarthEngine):
         max_lon: float,
         scale: int = 10,
         bands: list[str] | None = None,
-        dtype: Literal["uint8", "float32"] = "float32",
+        dtype: Literal["uint8", "int8", "float32"] = "float32",
+        num_workers: int | None = None,
+        single_file: bool = False,
+        output_format: Literal["geotiff", "zarr"] = "geotiff",
+        native_crs: bool = True,
     ) -> ee.Image | dict:
         """
         Download AlphaEarth embeddings for a lat/lon bounding box.
@@ -132,6 +257,18 @@ class AlphaEarthDownloader(EarthEngine):
             List of band names to download (default: all 64 bands).
         dtype:
             Data type of the output file (default: uint8).
+        num_workers:
+            Number of tiles downloaded in parallel (default: AE_WORKERS or 25).
+        single_file:
+            Whether to stream the tiles of each image into a single file
+            instead of writing one file per tile.
+        output_format:
+            Format of the output files (default: geotiff). With zarr,
+            every image is streamed into a single Zarr store.
+        native_crs:
+            Whether to download in the UTM zone of the bounding box (native
+            projection of AlphaEarth) instead of WGS84 when it lies within
+            a single zone, which avoids server-side reprojection (default: True).
 
         Returns
         -------
@@ -142,6 +279,15 @@ class AlphaEarthDownloader(EarthEngine):
         # Create bounding box geometry (WGS84)
         bbox = ee.Geometry.Rectangle([min_lon, min_lat, max_lon, max_lat])
 
+        # Use the UTM zone of the bounding box if it does not straddle zones
+        # Northern hemisphere: 32600 + zone, Southern: 32700 + zone
+        crs = "EPSG:4326"
+        min_zone = min(int((min_lon + 180) // 6) + 1, 60)
+        max_zone = min(int((max_lon + 180) // 6) + 1, 60)
+        if native_crs and min_zone == max_zone:
+            epsg_base = 32600 if (min_lat + max_lat) / 2 >= 0 else 32700
+            crs = f"EPSG:{epsg_base + min_zone}"
+
         return self._download_image(
             output_dir=output_dir,
             start_date=start_date,
@@ -149,8 +295,13 @@ class AlphaEarthDownloader(EarthEngine):
             geometry=bbox,
             scale=scale,
             bands=bands,
-            crs="EPSG:4326",
+            crs=crs,
             dtype=dtype,
+            num_workers=num_workers,
+            single_file=single_file,
+            output_format=output_format,
+            # In UTM, the WGS84 tiles are exported with envelopes extending past the box
+            clip=crs != "EPSG:4326",
         )
 
     def download_by_utm(
@@ -166,7 +317,10 @@ class AlphaEarthDownloader(EarthEngine):
         hemisphere: str = "N",
         scale: int = 10,
         bands: list[str] | None = None,
-        dtype: Literal["uint8", "float32"] = "float32",
+        dtype: Literal["uint8", "int8", "float32"] = "float32",
+        num_workers: int | None = None,
+        single_file: bool = False,
+        output_format: Literal["geotiff", "zarr"] = "geotiff",
     ) -> dict:
         """
         Download AlphaEarth embeddings for a UTM coordinate range.
@@ -199,6 +353,14 @@ class AlphaEarthDownloader(EarthEngine):
             List of band names to download (default: all 64 bands).
         dtype:
             Data type of the output file (default: uint8).
+        num_workers:
+            Number of tiles downloaded in parallel (default: AE_WORKERS or 25).
+        single_file:
+            Whether to stream the tiles of each image into a single file
+            instead of writing one file per tile.
+        output_format:
+            Format of the output files (default: geotiff). With zarr,
+            every image is streamed into a single Zarr store.
 
         Returns
         -------
@@ -235,7 +397,87 @@ class AlphaEarthDownloader(EarthEngine):
             bands=bands,
             crs=epsg_code,
             dtype=dtype,
+            num_workers=num_workers,
+            single_file=single_file,
+            output_format=output_format,
+            # Tiles follow the WGS84 bounds of the UTM box, which extend past it
+            clip=True,
+        )
+
+    def download_as_numpy(
+        self,
+        start_date: str,
+        end_date: str,
+        region: ee.FeatureCollection | ee.Geometry,
+        scale: int = 10,
+        bands: list[str] | None = None,
+        dtype: Literal["uint8", "int8", "float32"] = "float32",
+        crs: str = "EPSG:4326",
+        num_workers: int | None = None,
+    ) -> dict:
+        """
+        Download AlphaEarth embeddings for a region directly into a NumPy array.
+        Pixels are requested as arrays, which skips the GeoTIFF encoding and decoding.
+
+        Parameters
+        ----------
+        start_date:
+            Start date in format 'YYYY-MM-DD'.
+        end_date:
+            End date in format 'YYYY-MM-DD'.
+        region:
+            Region to download embeddings for.
+        scale:
+            Spatial resolution in meters (default: 10m).
+        bands:
+            List of band names to download (default: all 64 bands).
+        dtype:
+            Data type of the output array (default: float32).
+        crs:
+            Coordinate reference system of the output grid (default: EPSG:4326).
+        num_workers:
+            Number of tiles downloaded in parallel (default: AE_WORKERS or 25).
+
+        Returns
+        -------
+        dict:
+            Dictionary with the array of shape (bands, height, width),
+            its affine transform, coordinate reference system and band names.
+        """
+        if isinstance(region, ee.FeatureCollection):
+            geometry = region.geometry()
+        else:
+            geometry = region
+
+        image = self._download_image(
+            output_dir=None,
+            start_date=start_date,
+            end_date=end_date,
+            geometry=geometry,
+            scale=scale,
+            bands=bands,
+            crs=crs,
+            dtype=dtype,
         )
+        bands = list(bands or self.BAND_NAMES)
+
+        # Fill a preallocated array with the tiles as they arrive
+        transform, width, height = self._get_grid(geometry, scale, crs)
+        windows, _ = self._get_windows(width, height, len(bands), dtype)
+        array = np.empty((len(bands), height, width), dtype=dtype)
+        with ThreadPoolExecutor(
+            max_workers=num_workers or self.NUM_WORKERS
+        ) as executor:
+            tiles = executor.map(
+                lambda window: self._compute_pixels(
+                    image, bands, crs, transform, window
+                ),
+                windows,
+            )
+            for window, tile in zip(windows, tiles):
+                array[(slice(None), *window.toslices())] = tile
+
+        return {"array": array, "transform": transform, "crs": crs, "bands": bands}
 
     def _download_image(
         self,
@@ -247,7 +489,11 @@ class AlphaEarthDownloader(EarthEngine):
         bands: list[str] | None,
         crs: str,
         dtype: str,
+        single_file: bool = False,
         prefix: str = "",
+        clip: bool = False,
+        num_workers: int | None = None,
+        output_format: str = "geotiff",
     ) -> ee.Image | dict:
         """
         Internal method to download embeddings.
@@ -271,8 +517,16 @@ class AlphaEarthDownloader(EarthEngine):
             Coordinate reference system.
         dtype:
             Data type of the output file.
+        single_file:
+            Whether to stream the tiles of each image into a single file.
         prefix:
             Prefix to add to the output filename/s.
+        clip:
+            Whether to mask the downloaded pixels outside the geometry.
+        num_workers:
+            Number of tiles downloaded in parallel (default: NUM_WORKERS).
+        output_format:
+            Format of the output files (geotiff or zarr).
 
         Returns
         -------
@@ -283,23 +537,29 @@ class AlphaEarthDownloader(EarthEngine):
         filtered = self.collection.filterDate(start_date, end_date)
         filtered: ee.ImageCollection = filtered.filterBounds(geometry)
 
-        # Get image count
-        count = filtered.size().getInfo()
+        # Get image IDs, image bounds and bounds in a single request
+        key = self._get_cache_key(start_date, end_date, geometry.serialize())
+        image_ids, image_bounds, bounds = self._get_cached_metadata(
+            key, filtered, geometry, crs
+        )
+        count = len(image_ids)
         if count == 0:
             raise ValueError("No images found for specified date range and location.")
 
         # Select bands
-        if bands is None:
-            bands = self.BAND_NAMES
-        filtered = filtered.select(bands)
+        # The collection only holds the embedding bands, so the default
+        # selection is skipped to keep the computation graph small
+        subset = bands is not None and tuple(bands) != self.BAND_NAMES
+        if subset:
+            filtered = filtered.select(bands)
+        else:
+            bands = list(self.BAND_NAMES)
 
         # Return ee.Image object if output_dir is None
+        # A single image does not need to be mosaicked
         if output_dir is None:
-            return self._prepare_image(filtered.mosaic(), geometry, dtype)
-
-        # Get image info
-        # Use error margin for projected geometries (required for UTM)
-        bounds = self._get_bounds(geometry)
+            image = ee.Image(filtered.first()) if count == 1 else filtered.mosaic()
+            return self._prepare_image(image, geometry, dtype, clip=True)
 
         info = {
             "start_date": start_date,
@@ -316,30 +576,120 @@ class AlphaEarthDownloader(EarthEngine):
         output_dir.mkdir(mode=0o777, parents=True, exist_ok=True)
         assert output_dir.is_dir(), f"output_dir must be a directory: {output_dir}."
 
-        pbar = tqdm(
-            range(count), total=count, desc="Downloading images", colour="#00c8ff"
-        )
-        for i in pbar:
-            # Get the image from the collection
-            image = self._prepare_image(
-                ee.Image(filtered.toList(count).get(i)), geometry, dtype
-            )
-            img_geometry = image.geometry()
+        num_workers = num_workers or self.NUM_WORKERS
 
-            # Get the output path for the image
-            filename = self._get_filename(self._get_bounds(img_geometry), dtype, prefix)
-            path = output_dir / filename
+        # Split every image into tiles that fit in a single download request
+        jobs, unclipped_images = [], []
+        for image_id, img_bounds in zip(image_ids, image_bounds):
+            # Get the image by its asset ID
+            image = ee.Image(image_id)
+            if subset:
+                image = image.select(bands)
+            unclipped = self._prepare_image(image, geometry, dtype, clip=False)
+            image = self._prepare_image(image, geometry, dtype, clip)
+            num_bands = min(len(bands), self.BAND_CHUNK_SIZE)
+            tiles = self._get_tiles(img_bounds, scale, num_bands, dtype, crs)
 
-            # Download the image from the generated url
-            info["files"].append(
-                self._download_from_url(image, scale, img_geometry, crs, path)
-            )
+            if (single_file and len(tiles) > 1) or output_format == "zarr":
+                # Stream the tiles into a single file instead of one file per tile
+                bbox = self._bounds_to_bbox(img_bounds)
+                path = output_dir / self._get_filename(bbox, dtype, prefix)
+                if output_format == "zarr":
+                    path = path.with_suffix(".zarr")
+                info["files"].append(
+                    self._stream_tiles(
+                        image,
+                        ee.Geometry(img_bounds),
+                        scale,
+                        crs,
+                        bands,
+                        dtype,
+                        path,
+                        num_workers,
+                        output_format,
+                    )
+                )
+                continue
+
+            for tile in tiles:
+                # Get the output path for the tile
+                path = output_dir / self._get_filename(tile, dtype, prefix)
+
+                # Tiles are identified by the image, the download options and the bounds
+                key = (image_id, scale, crs, dtype, clip, tuple(bands))
+                key += tuple(round(coord, 6) for coord in tile)
+                jobs.append((key, image, scale, tile, crs, bands, path))
+                unclipped_images.append(unclipped)
+
+        # Skip the tiles outside the geometry and only clip the tiles on its boundary
+        if clip and jobs:
+            jobs = self._filter_tiles(geometry, jobs, unclipped_images)
+
+        # Download the tiles in parallel, every tile requesting the URLs of its next
+        # band chunks ahead in a second pool of the same size
+        # The progress bar follows the completed tiles, the results keep the tile order
+        # (failures are recorded per tile, so every tile gets its download information)
+        url_executor = ThreadPoolExecutor(max_workers=num_workers)
+        with url_executor, ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [
+                executor.submit(self._download_tile_once, *job, url_executor)
+                for job in jobs
+            ]
+            for _ in tqdm(
+                as_completed(futures),
+                total=len(futures),
+                desc="Downloading tiles",
+                colour="#00c8ff",
+            ):
+                pass
+            info["files"].extend(future.result() for future in futures)
 
         return info
 
+    @classmethod
+    def _filter_tiles(
+        cls, geometry: ee.Geometry, jobs: list[tuple], unclipped_images: list[ee.Image]
+    ) -> list[tuple]:
+        """
+        Drop the tile jobs outside the geometry and skip clipping the tiles inside it.
+        Clipping is a no-op for those tiles that still adds to the computation graph.
+
+        Parameters
+        ----------
+        geometry:
+            Earth Engine geometry object.
+        jobs:
+            Tile download jobs with clipped images.
+        unclipped_images:
+            Unclipped image of each job.
+
+        Returns
+        -------
+        list[tuple]:
+            Tile download jobs intersecting the geometry.
+        """
+
+        # Relation of each tile to the geometry (0: outside, 1: boundary, 2: inside)
+        def classify(bbox: ee.List) -> ee.Number:
+            rect = ee.Geometry.Rectangle(ee.List(bbox), None, False)
+            intersects = geometry.intersects(rect, 1)
+            return ee.Number(intersects).add(geometry.contains(rect, 1))
+
+        tiles = ee.List([list(job[3]) for job in jobs])
+        relations = tiles.map(classify).getInfo()
+
+        filtered = []
+        for job, unclipped, relation in zip(jobs, unclipped_images, relations):
+            if relation == 2:
+                job = (job[0], unclipped, *job[2:])
+            if relation > 0:
+                filtered.append(job)
+
+        return filtered
+
     @classmethod
     def _prepare_image(
-        cls, image: ee.Image, geometry: ee.Geometry, dtype: str
+        cls, image: ee.Image, geometry: ee.Geometry, dtype: str, clip: bool
     ) -> ee.Image:
         """
         Prepare the given image for download.
@@ -352,6 +702,8 @@ class AlphaEarthDownloader(EarthEngine):
             Earth Engine geometry object.
         dtype:
             Data type of the output file.
+        clip:
+            Whether to clip the image to the geometry.
 
         Returns
         -------
@@ -359,168 +711,1173 @@ class AlphaEarthDownloader(EarthEngine):
             Earth Engine image object.
         """
         # Clip the image to the geometry
-        image = image.clip(geometry)
+        # Downloads are already bounded by their region, so clipping is
+        # only needed to mask pixels outside non-rectangular geometries
+        if clip:
+            image = image.clip(geometry)
 
         # Convert the image to the requested dtype
         image = cls._convert_dtype(image, dtype)
 
         return image
 
-    @classmethod
-    def _get_bounds(cls, geometry: ee.Geometry) -> dict:
+    def _stream_tiles(
+        self,
+        image: ee.Image,
+        geometry: ee.Geometry,
+        scale: int,
+        crs: str,
+        bands: list[str],
+        dtype: str,
+        output_path: Path,
+        num_workers: int,
+        output_format: str = "geotiff",
+    ) -> dict:
         """
-        Get the bounds of the given geometry.
+        Internal method to stream an image tile by tile into a single GeoTIFF or Zarr store.
+        Tiles are fetched in parallel and written in row-major order,
+        so the full image is never assembled in memory.
 
         Parameters
         ----------
+        image:
+            Earth Engine image object.
         geometry:
             Earth Engine geometry object.
+        scale:
+            Resolution in meters.
+        crs:
+            Coordinate reference system.
+        bands:
+            Band names to export.
+        dtype:
+            Data type of the output file.
+        output_path:
+            Path to save the output file (GeoTIFF) or store (Zarr).
+        num_workers:
+            Number of tiles downloaded in parallel.
+        output_format:
+            Format of the output file (geotiff or zarr).
 
         Returns
         -------
         dict:
-            Dictionary with bounds information.
+            Dictionary with download information.
         """
+        transform, width, height = self._get_grid(geometry, scale, crs)
+        windows, tile_size = self._get_windows(width, height, len(bands), dtype)
+
+        profile = {
+            "driver": "GTiff",
+            "width": width,
+            "height": height,
+            "count": len(bands),
+            "dtype": dtype,
+            "crs": crs,
+            "transform": transform,
+            "tiled": True,
+            "blockxsize": 512,
+            "blockysize": 512,
+            "compress": "deflate",
+            "BIGTIFF": "IF_SAFER",
+        }
+
         try:
-            bounds = geometry.bounds(1).getInfo()  # 1 meter error margin
-        except BaseException:
-            bounds = geometry.bounds().getInfo()
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                arrays = self._iter_pixels(
+                    executor, image, bands, crs, transform, windows, num_workers * 2
+                )
+                if output_format == "zarr":
+                    # Chunks are aligned with the tiles, so every write covers whole chunks
+                    # (whole tiles are used as chunks if the block size does not divide them)
+                    blocksize = self.cog_options["blocksize"]
+                    chunk_size = blocksize if tile_size % blocksize == 0 else tile_size
+                    self._write_zarr(
+                        output_path, windows, arrays, profile, bands, chunk_size
+                    )
+                else:
+                    with rasterio.open(output_path, "w", **profile) as dst:
+                        for window, array in zip(windows, arrays):
+                            dst.write(array, window=window)
+            if output_format != "zarr":
+                convert_to_cog(output_path, **self.cog_options)
+            return {"success": True, "output_path": output_path}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @classmethod
+    def _iter_pixels(
+        cls,
+        executor: ThreadPoolExecutor,
+        image: ee.Image,
+        bands: list[str],
+        crs: str,
+        transform: Affine,
+        windows: list[Window],
+        max_pending: int,
+    ) -> Iterator[np.ndarray]:
+        """
+        Internal method to compute the pixels of windows in parallel, yielding them in order.
+        At most max_pending tiles are requested ahead of the consumer,
+        so a slow consumer does not pile up the downloaded tiles in memory.
+
+        Parameters
+        ----------
+        executor:
+            Executor computing the pixels.
+        image:
+            Earth Engine image object.
+        bands:
+            Band names to export.
+        crs:
+            Coordinate reference system.
+        transform:
+            Affine transform of the output grid.
+        windows:
+            Windows of the output grid to compute.
+        max_pending:
+            Maximum number of tiles requested ahead of the consumer.
 
-        return bounds
+        Returns
+        -------
+        Iterator[np.ndarray]:
+            Arrays of shape (bands, height, width) in the order of the windows.
+        """
+        pending: deque[Future] = deque()
+        try:
+            for window in windows:
+                pending.append(
+                    executor.submit(
+                        cls._compute_pixels, image, bands, crs, transform, window
+                    )
+                )
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Do not compute the remaining tiles if the consumer stopped early
+            for future in pending:
+                future.cancel()
 
     @classmethod
-    def _get_filename(cls, bounds: dict, dtype: str, prefix: str) -> str:
+    def _get_windows(
+        cls, width: int, height: int, num_bands: int, dtype: str
+    ) -> tuple[list[Window], int]:
         """
-        Get the filename for the given bounds.
+        Split a pixel grid into windows that fit in a single pixel request.
 
         Parameters
         ----------
-        bounds:
-            Dictionary with bounds information.
+        width:
+            Width of the grid in pixels.
+        height:
+            Height of the grid in pixels.
+        num_bands:
+            Number of bands to compute.
         dtype:
-            Data type of the output file.
-        prefix:
-            Prefix to add to the output filename.
+            Data type of the pixels.
 
         Returns
         -------
-        str:
-            Filename.
+        tuple[list[Window], int]:
+            Windows in row-major order and the tile size in pixels.
         """
-        filename = prefix + "_" if prefix else ""
-        filename += f"{dtype}_"
-        coords = np.array(bounds["coordinates"][0])
-        max_lon, max_lat = np.max(coords, axis=0)
-        min_lon, min_lat = np.min(coords, axis=0)
-        filename += f"[{min_lat:.3f}|{max_lat:.3f}|{min_lon:.3f}|{max_lon:.3f}].tif"
+        # Largest square tile (multiple of 256 pixels) below the request limit
+        max_pixels = cls.MAX_PIXELS_BYTES // (num_bands * cls.DTYPE_BYTES[dtype])
+        tile_size = max(math.isqrt(max_pixels) // 256 * 256, 256)
+        windows = [
+            Window(col, row, min(tile_size, width - col), min(tile_size, height - row))
+            for row in range(0, height, tile_size)
+            for col in range(0, width, tile_size)
+        ]
 
-        return filename
+        return windows, tile_size
 
     @classmethod
-    def _download_from_url(
+    def _write_zarr(
         cls,
-        image: ee.Image,
-        scale: int,
-        geometry: ee.Geometry,
-        crs: str,
         output_path: Path,
-    ) -> dict:
+        windows: list[Window],
+        arrays: Iterable[np.ndarray],
+        profile: dict,
+        bands: list[str],
+        chunk_size: int,
+    ) -> None:
         """
-        Internal method to download embeddings from a URL.
+        Internal method to write streamed tiles into a Zarr store.
+        The georeferencing and the band names are stored as attributes.
+
+        Parameters
+        ----------
+        output_path:
+            Path to save the Zarr store.
+        windows:
+            Windows of the tiles in the output grid.
+        arrays:
+            Pixel arrays of the tiles (bands, rows, columns).
+        profile:
+            Raster profile of the output grid.
+        bands:
+            Band names of the arrays.
+        chunk_size:
+            Size of the spatial chunks in pixels.
+        """
+        # Zarr is an optional dependency, only needed for Zarr output
+        import zarr
+
+        count, height, width = profile["count"], profile["height"], profile["width"]
+        store = zarr.open(
+            str(output_path),
+            mode="w",
+            shape=(count, height, width),
+            chunks=(count, chunk_size, chunk_size),
+            dtype=profile["dtype"],
+        )
+        store.attrs.update(
+            {
+                "crs": profile["crs"],
+                "transform": list(profile["transform"])[:6],
+                "band_names": list(bands),
+            }
+        )
+
+        for window, array in zip(windows, arrays):
+            store[(slice(None), *window.toslices())] = array
+
+    @classmethod
+    def _get_grid(
+        cls, geometry: ee.Geometry, scale: int, crs: str
+    ) -> tuple[Affine, int, int]:
+        """
+        Get the pixel grid covering the given geometry in the given projection.
 
         Parameters
         ----------
-        image:
-            Earth Engine image object.
-        scale:
-            Resolution in meters.
         geometry:
             Earth Engine geometry object.
+        scale:
+            Resolution in meters.
         crs:
             Coordinate reference system.
-        output_path:
-            Path to save the output file (GeoTIFF).
 
         Returns
         -------
-        dict:
-            Dictionary with download information.
+        tuple[Affine, int, int]:
+            Affine transform, width and height of the grid.
         """
-        try:
-            # Export image to file
-            geemap.ee_export_image(
-                image,
-                filename=output_path,
-                scale=scale,
-                region=geometry,
-                crs=crs,
-                verbose=False,
-            )
-            return {"success": True, "output_path": output_path}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        meta = ee.Dictionary(
+            {
+                "bounds": geometry.bounds(1, crs),
+                "projection": ee.Projection(crs).atScale(scale),
+            }
+        ).getInfo()
+        x_res = abs(meta["projection"]["transform"][0])
+        y_res = abs(meta["projection"]["transform"][4])
+
+        # Snap the bounds to the pixel grid
+        coords = np.array(meta["bounds"]["coordinates"][0])
+        min_x, min_y = np.floor(np.min(coords, axis=0) / [x_res, y_res])
+        max_x, max_y = np.ceil(np.max(coords, axis=0) / [x_res, y_res])
+
+        transform = from_origin(min_x * x_res, max_y * y_res, x_res, y_res)
+        return transform, int(max_x - min_x), int(max_y - min_y)
 
     @classmethod
-    def _convert_dtype(cls, image: ee.Image, dtype: str) -> ee.Image:
+    def _compute_pixels(
+        cls,
+        image: ee.Image,
+        bands: list[str],
+        crs: str,
+        transform: Affine,
+        window: Window,
+    ) -> np.ndarray:
         """
-        Internal method to convert the image to the requested dtype.
+        Internal method to compute the pixels of an image within a window.
 
         Parameters
         ----------
         image:
             Earth Engine image object.
-        dtype:
-            Data type of the output file.
+        bands:
+            Band names to export.
+        crs:
+            Coordinate reference system.
+        transform:
+            Affine transform of the output grid.
+        window:
+            Window of the output grid to compute.
 
         Returns
         -------
-        ee.Image:
-            Earth Engine image object with the requested dtype.
+        np.ndarray:
+            Array of shape (bands, height, width).
         """
-        if dtype == "uint8":
-            return quantize_ee(image)
-        elif dtype == "float32":
-            return image.float()
-        else:
-            raise ValueError(f"Invalid dtype: {dtype}")
+        x, y = transform * (window.col_off, window.row_off)
+        array = ee.data.computePixels(
+            {
+                "expression": image,
+                "fileFormat": "NUMPY_NDARRAY",
+                "bandIds": bands,
+                "grid": {
+                    "dimensions": {"width": window.width, "height": window.height},
+                    "affineTransform": {
+                        "scaleX": transform.a,
+                        "shearX": 0,
+                        "translateX": x,
+                        "shearY": 0,
+                        "scaleY": transform.e,
+                        "translateY": y,
+                    },
+                    "crsCode": crs,
+                },
+            }
+        )
+        return np.stack([array[band] for band in bands])
 
-    def get_available_dates(self, geometry: ee.Geometry | None = None) -> list[str]:
+    def _get_cached_metadata(
+        self,
+        key: str,
+        collection: ee.ImageCollection,
+        geometry: ee.Geometry,
+        crs: str,
+    ) -> tuple[list[str], list[dict], dict]:
         """
-        Get list of available dates in the collection.
+        Get the metadata of a download from the cache, or request it otherwise
+        (see _get_metadata).
 
         Parameters
         ----------
+        key:
+            Cache key of the download.
+        collection:
+            Earth Engine image collection object.
         geometry:
-            Optional geometry to filter by location
+            Earth Engine geometry object.
+        crs:
+            Coordinate reference system of the download.
 
         Returns
         -------
-        list[str]:
-            List of available dates.
+        tuple[list[str], list[dict], dict]:
+            Asset IDs, bounds of each image and dictionary with bounds information.
         """
-        collection = self.collection
-        if geometry:
-            collection = collection.filterBounds(geometry)
+        metadata = self._read_cache(key)
+        if metadata is None:
+            metadata = self._get_metadata(collection, geometry, crs)
+            # Empty results are not cached, the images may be published later
+            if len(metadata[0]) > 0:
+                self._write_cache(key, metadata)
 
-        dates = collection.aggregate_array("system:time_start").getInfo()
-        return [datetime.fromtimestamp(d / 1000).strftime("%Y-%m-%d") for d in dates]
+        return metadata
 
-    def get_info(self) -> dict:
+    @classmethod
+    def _get_metadata(
+        cls, collection: ee.ImageCollection, geometry: ee.Geometry, crs: str
+    ) -> tuple[list[str], list[dict], dict]:
         """
-        Get information about the AlphaEarth dataset.
+        Get the image IDs, the image bounds and the geometry bounds with a single request.
+
+        Parameters
+        ----------
+        collection:
+            Earth Engine image collection object.
+        geometry:
+            Earth Engine geometry object.
+        crs:
+            Coordinate reference system of the download.
 
         Returns
         -------
-        dict:
-            Dictionary with dataset information.
+        tuple[list[str], list[dict], dict]:
+            Asset IDs of the images in the collection, bounds of each image
+            within the geometry and dictionary with bounds information.
         """
-        return {
-            "dataset_id": self.DATASET_ID,
-            "num_bands": self.NUM_BANDS,
-            "band_names": self.BAND_NAMES,
-            "resolution": "10m",
-            "temporal_coverage": "2017-2024 (annual)",
-            "coordinate_system": "UTM (native), WGS84 supported",
-            "band_range": "-1 to 1 (unit vectors)",
-            "license": "CC-BY 4.0",
-        }
+
+        def get_meta(max_error: int | None) -> dict:
+            # Bounds of the image footprints intersected with the geometry
+            images = collection.map(
+                lambda image: image.set(
+                    "bounds",
+                    image.geometry().intersection(geometry, 1).bounds(max_error),
+                )
+            )
+            return ee.Dictionary(
+                {
+                    "ids": images.aggregate_array("system:id"),
+                    "image_bounds": images.aggregate_array("bounds"),
+                    "bounds": geometry.bounds(max_error),
+                }
+            ).getInfo()
+
+        # Use error margin for projected geometries (required for UTM),
+        # the other variant is only requested if the first one fails
+        margins = (None, 1) if crs == "EPSG:4326" else (1, None)
+        try:
+            meta = get_meta(margins[0])
+        except ee.EEException:
+            meta = get_meta(margins[1])
+
+        return meta["ids"], meta["image_bounds"], meta["bounds"]
+
+    @classmethod
+    def _get_tiles(
+        cls,
+        bounds: dict,
+        scale: int,
+        num_bands: int,
+        dtype: str,
+        crs: str = "EPSG:4326",
+        max_bytes: int | None = None,
+    ) -> list[tuple[float, float, float, float]]:
+        """
+        Split the given bounds into tiles that fit in a single download request.
+
+        Parameters
+        ----------
+        bounds:
+            Dictionary with bounds information.
+        scale:
+            Resolution in meters.
+        num_bands:
+            Number of bands to download.
+        dtype:
+            Data type of the output file.
+        crs:
+            Coordinate reference system of the output file.
+        max_bytes:
+            Maximum size of a tile in bytes (default: MAX_REQUEST_BYTES).
+
+        Returns
+        -------
+        list[tuple[float, float, float, float]]:
+            List of tile bounds (west, south, east, north) in WGS84 covering the bounds.
+        """
+        min_lon, min_lat, max_lon, max_lat = cls._bounds_to_bbox(bounds)
+
+        # Largest square tile (in pixels) below the request limits
+        max_bytes = max_bytes or cls.MAX_REQUEST_BYTES
+        max_pixels = max_bytes // (num_bands * cls.DTYPE_BYTES[dtype])
+        tile_pixels = min(math.isqrt(max_pixels), cls.MAX_REQUEST_DIMENSION)
+        lat_step = tile_pixels * scale / cls.METERS_PER_DEGREE
+
+        if CRS.from_user_input(crs).is_geographic:
+            # Pixels have a constant size in degrees, so tiles are as wide as they are tall
+            lon_step = lat_step
+        else:
+            # A degree of longitude shrinks with latitude, so tiles can be wider in
+            # projected (metric) outputs (measured at the latitude closest to the equator)
+            min_abs_lat = (
+                0.0 if min_lat <= 0 <= max_lat else min(abs(min_lat), abs(max_lat))
+            )
+            lon_step = lat_step / max(math.cos(math.radians(min_abs_lat)), 1e-6)
+
+        # Spread the extent evenly over the tiles to avoid thin slivers at the edges
+        num_rows = max(math.ceil((max_lat - min_lat) / lat_step), 1)
+        num_cols = max(math.ceil((max_lon - min_lon) / lon_step), 1)
+        lat_step = (max_lat - min_lat) / num_rows
+        lon_step = (max_lon - min_lon) / num_cols
+
+        tiles = []
+        for row in range(num_rows):
+            south = float(min_lat + row * lat_step)
+            north = float(max_lat if row == num_rows - 1 else south + lat_step)
+            for col in range(num_cols):
+                west = float(min_lon + col * lon_step)
+                east = float(max_lon if col == num_cols - 1 else west + lon_step)
+                tiles.append((west, south, east, north))
+
+        return tiles
+
+    @classmethod
+    def _make_tile(cls, west: float, south: float, east: float, north: float) -> dict:
+        """
+        Create a rectangular tile from its WGS84 bounds.
+
+        Parameters
+        ----------
+        west:
+            Minimum longitude (degrees).
+        south:
+            Minimum latitude (degrees).
+        east:
+            Maximum longitude (degrees).
+        north:
+            Maximum latitude (degrees).
+
+        Returns
+        -------
+        dict:
+            GeoJSON polygon of the tile.
+        """
+        return {
+            "type": "Polygon",
+            "coordinates": [
+                [
+                    [west, south],
+                    [east, south],
+                    [east, north],
+                    [west, north],
+                    [west, south],
+                ]
+            ],
+            "geodesic": False,
+        }
+
+    @classmethod
+    def _bounds_to_bbox(cls, bounds: dict) -> tuple[float, float, float, float]:
+        """
+        Get the bounding box of the given bounds.
+
+        Parameters
+        ----------
+        bounds:
+            Dictionary with bounds information.
+
+        Returns
+        -------
+        tuple[float, float, float, float]:
+            Bounding box (min_lon, min_lat, max_lon, max_lat).
+        """
+        # Plain Python is faster than NumPy for the few points of a bounding box
+        lons, lats = zip(*bounds["coordinates"][0])
+        return min(lons), min(lats), max(lons), max(lats)
+
+    @classmethod
+    def _get_filename(
+        cls, bbox: tuple[float, float, float, float], dtype: str, prefix: str
+    ) -> str:
+        """
+        Get the filename for the given bounding box.
+
+        Parameters
+        ----------
+        bbox:
+            Bounding box (min_lon, min_lat, max_lon, max_lat).
+        dtype:
+            Data type of the output file.
+        prefix:
+            Prefix to add to the output filename.
+
+        Returns
+        -------
+        str:
+            Filename.
+        """
+        min_lon, min_lat, max_lon, max_lat = bbox
+        prefix = prefix + "_" if prefix else ""
+        return f"{prefix}{dtype}_[{min_lat:.3f}|{max_lat:.3f}|{min_lon:.3f}|{max_lon:.3f}].tif"
+
+    def _download_tile_once(
+        self,
+        key: tuple,
+        image: ee.Image,
+        scale: int,
+        tile: tuple[float, float, float, float],
+        crs: str,
+        bands: list[str],
+        output_path: Path,
+        url_executor: ThreadPoolExecutor | None = None,
+    ) -> dict:
+        """
+        Internal method to download a tile unless it was already downloaded,
+        either to the same output path or by a previous call of this instance.
+        Downloaded tiles are recorded in a sidecar file with the hash of their key,
+        so an existing file is only reused for the exact same request.
+
+        Parameters
+        ----------
+        key:
+            Key identifying the tile.
+        image:
+            Earth Engine image object.
+        scale:
+            Resolution in meters.
+        tile:
+            Bounds of the tile to download (west, south, east, north).
+        crs:
+            Coordinate reference system.
+        bands:
+            Band names to export.
+        output_path:
+            Path to save the output file (GeoTIFF).
+        url_executor:
+            Thread pool requesting the download URLs of the band chunks ahead.
+
+        Returns
+        -------
+        dict:
+            Dictionary with download information.
+        """
+        # Failures are reported per tile, so one tile does not abort the whole download
+        try:
+            return self._reuse_or_download_tile(
+                key, image, scale, tile, crs, bands, output_path, url_executor
+            )
+        except Exception as e:
+            return {"success": False, "error": str(e), "attempts": 0}
+
+    def _reuse_or_download_tile(
+        self,
+        key: tuple,
+        image: ee.Image,
+        scale: int,
+        tile: tuple[float, float, float, float],
+        crs: str,
+        bands: list[str],
+        output_path: Path,
+        url_executor: ThreadPoolExecutor | None = None,
+    ) -> dict:
+        """
+        Internal method to reuse an already downloaded tile, or download it otherwise
+        (see _download_tile_once).
+        """
+        key_hash = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+        key_path = output_path.with_name(output_path.name + ".json")
+
+        # Same request downloaded to the same output path
+        # (a tile split into quadrants is recorded with the files of its quadrants)
+        try:
+            record = json.loads(key_path.read_text())
+        except (OSError, ValueError):
+            record = {}
+        if record.get("key") == key_hash:
+            paths = [output_path.with_name(name) for name in record["files"]]
+            if all(path.is_file() for path in paths):
+                return self._get_tile_info(output_path, paths, skipped=True)
+
+        # Same request downloaded to another output directory by a previous call
+        seen_paths = self._seen.get(key)
+        if seen_paths and all(path.is_file() for path in seen_paths):
+            paths = [output_path.with_name(path.name) for path in seen_paths]
+            for seen_path, path in zip(seen_paths, paths):
+                if seen_path != path:
+                    self._copy_tile(seen_path, path)
+            self._write_tile_record(key_path, key_hash, paths)
+            return self._get_tile_info(output_path, paths, skipped=True)
+
+        # The previous record (if any) is dropped, as the files are being replaced
+        key_path.unlink(missing_ok=True)
+        info = self._download_tile(
+            image, scale, tile, crs, bands, output_path, url_executor
+        )
+        if info["success"]:
+            self._write_tile_record(key_path, key_hash, info["output_paths"])
+            self._seen[key] = info["output_paths"]
+
+        return info
+
+    @classmethod
+    def _get_tile_info(
+        cls, output_path: Path, paths: list[Path], attempts: int = 0, **kwargs
+    ) -> dict:
+        """
+        Get the download information of a successfully downloaded tile.
+
+        Parameters
+        ----------
+        output_path:
+            Path of the tile.
+        paths:
+            Files of the tile, either the tile itself or its quadrants.
+        attempts:
+            Number of download attempts.
+        kwargs:
+            Additional download information.
+
+        Returns
+        -------
+        dict:
+            Dictionary with download information.
+        """
+        info = {"success": True, "attempts": attempts, "output_paths": paths}
+        if paths == [output_path]:
+            info["output_path"] = output_path
+        return {**info, **kwargs}
+
+    @classmethod
+    def _write_tile_record(
+        cls, key_path: Path, key_hash: str, paths: list[Path]
+    ) -> None:
+        """
+        Record the request key and the files of a downloaded tile in its sidecar file.
+
+        Parameters
+        ----------
+        key_path:
+            Path of the sidecar file.
+        key_hash:
+            Hash of the request key of the tile.
+        paths:
+            Files of the tile (in the directory of the sidecar file).
+        """
+        record = {"key": key_hash, "files": [path.name for path in paths]}
+        key_path.write_text(json.dumps(record))
+
+    @classmethod
+    def _copy_tile(cls, source: Path, target: Path) -> None:
+        """
+        Hard-link a downloaded tile to another path, or copy it if linking fails
+        (e.g. across file systems).
+
+        Parameters
+        ----------
+        source:
+            Path of the downloaded tile.
+        target:
+            Path to link or copy the tile to.
+        """
+        target.unlink(missing_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+    def _download_tile(
+        self,
+        image: ee.Image,
+        scale: int,
+        tile: tuple[float, float, float, float],
+        crs: str,
+        bands: list[str],
+        output_path: Path,
+        url_executor: ThreadPoolExecutor | None = None,
+    ) -> dict:
+        """
+        Internal method to download a tile.
+        Bands are downloaded in chunks and stacked into a single file,
+        tiles exceeding the request limits are split into quadrants.
+
+        Parameters
+        ----------
+        image:
+            Earth Engine image object.
+        scale:
+            Resolution in meters.
+        tile:
+            Bounds of the tile to download (west, south, east, north).
+        crs:
+            Coordinate reference system.
+        bands:
+            Band names to export.
+        output_path:
+            Path to save the output file (GeoTIFF).
+        url_executor:
+            Thread pool requesting the download URLs of the band chunks ahead.
+
+        Returns
+        -------
+        dict:
+            Dictionary with download information.
+        """
+        size = self.BAND_CHUNK_SIZE
+        chunks = [bands[i : i + size] for i in range(0, len(bands), size)]
+        if len(chunks) == 1:
+            images, paths = [image], [output_path]
+        else:
+            images = [image.select(chunk) for chunk in chunks]
+            paths = [
+                output_path.with_suffix(f".bands_{i:02d}.tmp")
+                for i in range(len(chunks))
+            ]
+
+        # Request the URLs of the next chunks while the first chunk is transferred
+        # (the first URL is requested by this thread, so it never waits in the pool)
+        params = self._get_download_params(scale, tile, crs)
+        urls = [None] * len(images)
+        if url_executor is not None:
+            urls[1:] = [
+                url_executor.submit(chunk_image.getDownloadURL, params)
+                for chunk_image in images[1:]
+            ]
+
+        parts = []
+        for chunk_image, path, url in zip(images, paths, urls):
+            parts.append(self._download_from_url(chunk_image, params, path, url))
+            if not parts[-1]["success"]:
+                for future in urls[len(parts) :]:
+                    if future is not None:
+                        future.cancel()
+                break
+        attempts = sum(part["attempts"] for part in parts)
+
+        if not parts[-1]["success"]:
+            for path in paths:
+                path.unlink(missing_ok=True)
+
+            # Split the tile if it exceeds the request size or dimension limits
+            if parts[-1]["too_large"]:
+                info = self._download_quadrants(
+                    image, scale, tile, crs, bands, output_path, url_executor
+                )
+                info["attempts"] += attempts
+                return info
+
+            return {"success": False, "error": parts[-1]["error"], "attempts": attempts}
+
+        # Stack the band chunks into a single file
+        # (written next to the tile, so a partial stack is never taken for a tile)
+        if len(chunks) > 1:
+            stack_path = output_path.with_suffix(".stack.tmp")
+            stack_tif_files(paths, stack_path, delete_after=True)
+            stack_path.replace(output_path)
+        convert_to_cog(output_path, **self.cog_options)
+
+        return self._get_tile_info(output_path, [output_path], attempts)
+
+    @classmethod
+    def _download_from_url(
+        cls,
+        image: ee.Image,
+        params: dict,
+        output_path: Path,
+        url: Future | None = None,
+    ) -> dict:
+        """
+        Internal method to download embeddings from a URL.
+        Throttled and transient failures are retried with exponential backoff.
+
+        Parameters
+        ----------
+        image:
+            Earth Engine image object.
+        params:
+            Download parameters (see _get_download_params).
+        output_path:
+            Path to save the output file (GeoTIFF).
+        url:
+            Download URL requested ahead, used for the first attempt.
+
+        Returns
+        -------
+        dict:
+            Dictionary with download information.
+        """
+        for attempt in range(1, cls.MAX_RETRIES + 1):
+            try:
+                if attempt == 1 and url is not None:
+                    download_url = url.result()
+                else:
+                    download_url = image.getDownloadURL(params)
+                with _SESSION.get(
+                    download_url, timeout=cls.REQUEST_TIMEOUT, stream=True
+                ) as response:
+                    if response.ok:
+                        cls._write_response(response, output_path)
+                        return {"success": True, "attempts": attempt}
+                    error = cls._get_error_message(response)
+                    transient = response.status_code in cls.RETRY_STATUS_CODES
+            except requests.RequestException as e:
+                error, transient = str(e), True
+            except ee.EEException as e:
+                error = str(e)
+                transient = any(key in error.lower() for key in cls.TRANSIENT_ERRORS)
+
+            if not transient or attempt == cls.MAX_RETRIES:
+                break
+            time.sleep(min(60, 2**attempt + random.random() * 0.5))
+
+        # Size and dimension limit errors are reported so the tile can be split
+        return {
+            "success": False,
+            "error": error,
+            "attempts": attempt,
+            "too_large": "must be less than or equal to" in error,
+        }
+
+    @classmethod
+    def _get_download_params(
+        cls, scale: int, tile: tuple[float, float, float, float], crs: str
+    ) -> dict:
+        """
+        Get the download parameters of a tile.
+
+        Parameters
+        ----------
+        scale:
+            Resolution in meters.
+        tile:
+            Bounds of the tile to download (west, south, east, north).
+        crs:
+            Coordinate reference system.
+
+        Returns
+        -------
+        dict:
+            Parameters of the download request.
+        """
+        return {
+            "scale": scale,
+            "region": ee.Geometry(cls._make_tile(*tile)),
+            "crs": crs,
+            "format": "GEO_TIFF",
+            "filePerBand": False,
+        }
+
+    def _download_quadrants(
+        self,
+        image: ee.Image,
+        scale: int,
+        tile: tuple[float, float, float, float],
+        crs: str,
+        bands: list[str],
+        output_path: Path,
+        url_executor: ThreadPoolExecutor | None = None,
+    ) -> dict:
+        """
+        Internal method to download a tile as four quadrants.
+
+        Parameters
+        ----------
+        image:
+            Earth Engine image object.
+        scale:
+            Resolution in meters.
+        tile:
+            Bounds of the tile to download (west, south, east, north).
+        crs:
+            Coordinate reference system.
+        bands:
+            Band names to export.
+        output_path:
+            Path of the tile, the quadrant index is appended to its name.
+        url_executor:
+            Thread pool requesting the download URLs of the band chunks ahead.
+
+        Returns
+        -------
+        dict:
+            Dictionary with download information of the quadrants.
+        """
+        west, south, east, north = tile
+        mid_lon, mid_lat = (west + east) / 2, (south + north) / 2
+        quadrants = [
+            (west, south, mid_lon, mid_lat),
+            (mid_lon, south, east, mid_lat),
+            (west, mid_lat, mid_lon, north),
+            (mid_lon, mid_lat, east, north),
+        ]
+
+        parts = [
+            self._download_tile(
+                image,
+                scale,
+                quadrant,
+                crs,
+                bands,
+                output_path.with_name(f"{output_path.stem}_{i}{output_path.suffix}"),
+                url_executor,
+            )
+            for i, quadrant in enumerate(quadrants)
+        ]
+
+        attempts = sum(part["attempts"] for part in parts)
+        if not all(part["success"] for part in parts):
+            return {"success": False, "attempts": attempts, "parts": parts}
+
+        # The tile is made of the files of its quadrants
+        paths = [path for part in parts for path in part["output_paths"]]
+        return self._get_tile_info(output_path, paths, attempts, parts=parts)
+
+    @classmethod
+    def _write_response(cls, response: requests.Response, output_path: Path) -> None:
+        """
+        Stream the body of a download response to the given path.
+        The file is written next to the output path and renamed once complete,
+        so an interrupted transfer never leaves a truncated file behind.
+
+        Parameters
+        ----------
+        response:
+            Response of the download request.
+        output_path:
+            Path to save the output file.
+        """
+        part_path = output_path.with_name(output_path.name + ".part")
+        try:
+            with open(part_path, "wb") as file:
+                for chunk in response.iter_content(cls.STREAM_CHUNK_BYTES):
+                    file.write(chunk)
+            part_path.replace(output_path)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def _get_error_message(cls, response: requests.Response) -> str:
+        """
+        Get the error message of a failed download response.
+
+        Parameters
+        ----------
+        response:
+            Response of the download request.
+
+        Returns
+        -------
+        str:
+            Error message.
+        """
+        try:
+            return response.json()["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            return f"{response.status_code} {response.reason}"
+
+    @classmethod
+    def _convert_dtype(cls, image: ee.Image, dtype: str) -> ee.Image:
+        """
+        Internal method to convert the image to the requested dtype.
+
+        Parameters
+        ----------
+        image:
+            Earth Engine image object.
+        dtype:
+            Data type of the output file.
+
+        Returns
+        -------
+        ee.Image:
+            Earth Engine image object with the requested dtype.
+        """
+        if dtype == "uint8":
+            return quantize_ee(image)
+        elif dtype == "int8":
+            # Linear quantization, divide by 127 to restore the embeddings
+            expression = "int8(round(b * 127))"
+            return image.expression(expression, {"b": image}).rename(image.bandNames())
+        elif dtype == "float32":
+            return image.float()
+        else:
+            raise ValueError(f"Invalid dtype: {dtype}")
+
+    def get_available_dates(self, geometry: ee.Geometry | None = None) -> list[str]:
+        """
+        Get list of available dates in the collection.
+
+        Parameters
+        ----------
+        geometry:
+            Optional geometry to filter by location
+
+        Returns
+        -------
+        list[str]:
+            Sorted list of unique available dates.
+        """
+        key = self._get_cache_key("dates", geometry.serialize() if geometry else "")
+        dates = self._read_cache(key)
+        if dates is not None:
+            return list(dates)
+
+        collection = self.collection
+        if geometry:
+            collection = collection.filterBounds(geometry)
+
+        # Format and deduplicate the dates on the server
+        dates = collection.aggregate_array("system:time_start").map(
+            lambda t: ee.Date(t).format("YYYY-MM-dd")
+        )
+        dates = dates.distinct().sort().getInfo()
+        if dates:
+            self._write_cache(key, dates)
+
+        return list(dates)
+
+    @classmethod
+    def _get_cache_key(cls, *parts: str) -> str:
+        """
+        Get the cache key of the given request parts.
+
+        Parameters
+        ----------
+        parts:
+            Strings identifying the request.
+
+        Returns
+        -------
+        str:
+            Hexadecimal SHA-1 digest of the parts.
+        """
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def _read_cache(self, key: str) -> list | None:
+        """
+        Read a cached metadata entry.
+
+        Parameters
+        ----------
+        key:
+            Cache key of the entry.
+
+        Returns
+        -------
+        list | None:
+            Cached metadata, or None if the entry is missing or expired.
+        """
+        # Entries requested by this instance are kept in memory
+        if key in self._memory_cache:
+            return self._memory_cache[key]
+        if self.cache_dir is None:
+            return None
+
+        path = self.cache_dir / f"{key}.json"
+        try:
+            if self.cache_ttl is not None:
+                if time.time() - path.stat().st_mtime > self.cache_ttl:
+                    return None
+            with open(path) as file:
+                value = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        self._memory_cache[key] = value
+        return value
+
+    def _write_cache(self, key: str, value: list | tuple) -> None:
+        """
+        Write a metadata entry to the cache.
+
+        Parameters
+        ----------
+        key:
+            Cache key of the entry.
+        value:
+            JSON serializable metadata.
+        """
+        self._memory_cache[key] = value
+        if self.cache_dir is None:
+            return
+
+        # Write to a temporary file first, so readers never see a partial entry
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(value, file)
+        tmp_path.replace(path)
+
+    def clear_cache(self) -> None:
+        """
+        Remove the cached metadata, both in memory and on disk,
+        so the next requests fetch it from Earth Engine again.
+        """
+        self._memory_cache.clear()
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return
+
+        # Only cache entries are removed (named by their SHA-1 key)
+        for path in self.cache_dir.glob("*.json"):
+            if len(path.stem) == 40:
+                path.unlink(missing_ok=True)
+
+    def get_info(self) -> MappingProxyType:
+        """
+        Get information about the AlphaEarth dataset.
+
+        Returns
+        -------
+        MappingProxyType:
+            Read-only dictionary with dataset information.
+        """
+        return self.INFO
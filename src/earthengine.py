@@ -1,14 +1,27 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
+import os
+
 import ee
 
+# Endpoint recommended by Earth Engine for parallel, automated requests
+HIGH_VOLUME_URL = "https://earthengine-highvolume.googleapis.com"
+
 
 class EarthEngine:
     """
     Earth Engine client for authentication and initialization.
     """
 
-    def __init__(self, project: str | None = None, authenticate: bool = True) -> None:
+    # Process, project and endpoint of the current Earth Engine session (shared by all clients)
+    _session: tuple[int, str | None, str | None] | None = None
+
+    def __init__(
+        self,
+        project: str | None = None,
+        authenticate: bool = True,
+        url: str | None = None,
+    ) -> None:
         """
         Initialize the Earth Engine client.
 
@@ -18,34 +31,55 @@ class EarthEngine:
             Google Cloud project ID (required for Earth Engine access).
         authenticate:
             Whether to authenticate with Earth Engine.
+        url:
+            Earth Engine API endpoint (default: the standard endpoint).
+        """
+        # Earth Engine keeps a single global session, so it is only initialized again
+        # if the project or endpoint changes, or in a new (e.g. forked worker) process
+        # whose inherited connections must not be shared with its parent
+        session = (os.getpid(), project, url)
+        if authenticate and EarthEngine._session != session:
+            self._initialize(project, url)
+            EarthEngine._session = session
+
+    @classmethod
+    def _initialize(cls, project: str | None, url: str | None) -> None:
+        """
+        Authenticate and initialize Earth Engine.
+
+        Parameters
+        ----------
+        project:
+            Google Cloud project ID.
+        url:
+            Earth Engine API endpoint.
         """
-        if authenticate:
-            try:
-                # Try to initialize with project
-                if project:
-                    ee.Initialize(project=project)
-                else:
-                    # Try default initialization first
-                    try:
-                        ee.Initialize()
-                    except Exception as e:
-                        if (
-                            "project" in str(e).lower()
-                            or "not registered" in str(e).lower()
-                        ):
-                            raise ValueError(
-                                "Earth Engine requires a project ID. Please provide your "
-                                "Google Cloud project ID:\n"
-                                "  downloader = AlphaEarthDownloader(project='your-project-id')\n"
-                                "Or set the EE_PROJECT environment variable."
-                            ) from e
-                        raise
-            except Exception as e:
-                if "project" in str(e).lower() or "not registered" in str(e).lower():
+        try:
+            # Try to initialize with project
+            if project:
+                ee.Initialize(project=project, url=url)
+            else:
+                # Try default initialization first
+                try:
+                    ee.Initialize(url=url)
+                except Exception as e:
+                    if (
+                        "project" in str(e).lower()
+                        or "not registered" in str(e).lower()
+                    ):
+                        raise ValueError(
+                            "Earth Engine requires a project ID. Please provide your "
+                            "Google Cloud project ID:\n"
+                            "  downloader = AlphaEarthDownloader(project='your-project-id')\n"
+                            "Or set the EE_PROJECT environment variable."
+                        ) from e
                     raise
-                print("Authentication required. Running ee.Authenticate()...")
-                ee.Authenticate()
-                if project:
-                    ee.Initialize(project=project)
-                else:
-                    ee.Initialize()
+        except Exception as e:
+            if "project" in str(e).lower() or "not registered" in str(e).lower():
+                raise
+            print("Authentication required. Running ee.Authenticate()...")
+            ee.Authenticate()
+            if project:
+                ee.Initialize(project=project, url=url)
+            else:
+                ee.Initialize(url=url)
@@ -1,46 +1,65 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
+import multiprocessing
+import os
 import shutil
+import stat
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import ee
 import numpy as np
-import rasterio
-from rasterio.merge import merge
 
+if TYPE_CHECKING:
+    # Only needed for annotations, Earth Engine and rasterio are imported where they are used,
+    # so the NumPy helpers can be used without loading them
+    import ee
+    import rasterio
+    from rasterio.windows import Window
 
+# Number of elements (de)quantized at once, so the temporary buffers stay small
+_BLOCK_SIZE = 1 << 16
+
+# Embedding value of every uint8 value: sign(x) * x^2 with x = (value - 128) / 127.5
+_DEQUANTIZE_LUT = (np.arange(256, dtype=np.float32) - 128) / np.float32(127.5)
+_DEQUANTIZE_LUT = _DEQUANTIZE_LUT * _DEQUANTIZE_LUT * np.sign(_DEQUANTIZE_LUT)
+
+
+@lru_cache(maxsize=1)
 def is_notebook() -> bool:
     """
     Check if the code is running in a Jupyter notebook or IPython environment.
+    The result cannot change within a process, so it is computed only once.
 
     Returns
     -------
     bool:
         True if running in a notebook/IPython, False otherwise.
     """
+    # Notebook kernels always load ipykernel, so IPython is not imported needlessly
+    if "ipykernel" not in sys.modules:
+        return False
+
     try:
         # Check if we're in IPython/Jupyter environment
         from IPython import get_ipython
-
-        ipython = get_ipython()
-
-        # If we have an IPython instance, check if it's a notebook
-        if ipython is not None:
-            # Check if we're in a notebook by looking at the class name
-            if "IPKernelApp" in str(type(ipython)):
-                return True
-            # Alternative check for notebook environment
-            if hasattr(ipython, "kernel") and ipython.kernel is not None:
-                return True
-        return False
-    except BaseException:
+    except ImportError:
         return False
 
+    # A notebook runs an IPython instance with a kernel attached
+    ipython = get_ipython()
+    return ipython is not None and getattr(ipython, "kernel", None) is not None
+
 
 def merge_tif_directory(
     input_dir: str | Path,
     output_path: str | Path | None = None,
     delete_after: bool = False,
+    num_workers: int | None = None,
 ) -> None:
     """
     Merge all .tif files in the input directory into a single .tif file.
@@ -53,16 +72,24 @@ def merge_tif_directory(
         Path to the output .tif file.
     delete_after:
         Whether to delete the source files after merging.
+    num_workers:
+        Number of threads reading the source files (see merge_tif_files).
     """
     input_dir = Path(input_dir)
     assert input_dir.is_dir(), "Input directory must exist."
-    files = list(input_dir.glob("*.tif"))
+    # Directory entries carry the file type, so listing needs no extra stat calls
+    with os.scandir(input_dir) as entries:
+        files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".tif") and entry.is_file()
+        ]
 
     if not output_path:
         output_path = input_dir.with_suffix(".tif")
 
     # Merge the files
-    merge_tif_files(files, output_path, delete_after)
+    merge_tif_files(files, output_path, delete_after, num_workers=num_workers)
 
     # Remove the input directory if requested
     if delete_after:
@@ -70,7 +97,11 @@ def merge_tif_directory(
 
 
 def merge_tif_files(
-    files: list[str | Path], output_path: str | Path, delete_after: bool = False
+    files: list[str | Path],
+    output_path: str | Path,
+    delete_after: bool = False,
+    num_workers: int | None = None,
+    use_processes: bool = False,
 ) -> None:
     """
     Merge a list of .tif files into a single .tif file.
@@ -83,29 +114,239 @@ def merge_tif_files(
         Path to the output .tif file.
     delete_after:
         Whether to delete the source files after merging.
+    num_workers:
+        Number of threads reading the source files (default: number of CPUs + 4, up to 32),
+        or number of processes (default: number of CPUs).
+    use_processes:
+        Whether to read the source files in worker processes instead of threads,
+        for large mosaics bound by decompression (scripts must guard with `if __name__ == "__main__"`).
     """
+    import rasterio
+    from rasterio.transform import from_origin
+
     files = [Path(file) for file in files]
     assert all(
-        file.is_file() and file.suffix == ".tif" and file.exists() for file in files
+        _is_tif_file(file) for file in files
     ), "All files must exist and be .tif files."
     assert len(files) > 0, "No files to merge."
 
-    # Merge source files
     srcs = [rasterio.open(file) for file in files]
-    merged, out_trans = merge(srcs)
+    res_x, res_y = srcs[0].res
+    nodata = srcs[0].nodata
+
+    # Output grid covering all source files
+    west = min(src.bounds.left for src in srcs)
+    south = min(src.bounds.bottom for src in srcs)
+    east = max(src.bounds.right for src in srcs)
+    north = max(src.bounds.top for src in srcs)
 
     profile: dict = srcs[0].profile
     profile.update(
         {
-            "height": merged.shape[1],
-            "width": merged.shape[2],
-            "transform": out_trans,
+            "height": round((north - south) / res_y),
+            "width": round((east - west) / res_x),
+            "transform": from_origin(west, north, res_x, res_y),
+            "nodata": nodata,
+            "tiled": True,
+            "blockxsize": 512,
+            "blockysize": 512,
+            # Horizontal (integer) or floating point predictor depending on the dtype
+            "compress": "DEFLATE",
+            "predictor": 3 if np.dtype(profile["dtype"]).kind == "f" else 2,
+            "num_threads": "ALL_CPUS",
+            "BIGTIFF": "IF_SAFER",
         }
     )
 
-    # Save merged file
+    # Threads share the opened files, every file is read by one thread at a time
+    # (handles are not thread-safe), so only one handle per file is ever open
+    locks = [threading.Lock() for _ in srcs]
+
+    def merge_window(window: "Window") -> np.ndarray:
+        return _merge_window(srcs, profile, window, locks)
+
+    # Merge block by block, so the mosaic is never fully loaded in memory,
+    # blocks are read in parallel and written in order by this thread
+    try:
+        with rasterio.open(output_path, "w", **profile) as dst:
+            windows = [window for _, window in dst.block_windows(1)]
+            if use_processes:
+                # Every process opens the source files once, only the blocks are sent back,
+                # processes are spawned so they do not inherit the open GDAL handles
+                num_workers = num_workers or os.cpu_count() or 1
+                executor = ProcessPoolExecutor(
+                    max_workers=num_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_merge_process,
+                    initargs=(files, profile),
+                )
+                merge_fn = _merge_window_in_process
+            else:
+                num_workers = num_workers or min(32, (os.cpu_count() or 1) + 4)
+                executor = ThreadPoolExecutor(max_workers=num_workers)
+                merge_fn = merge_window
+
+            with executor:
+                # Submit a bounded batch at a time to keep the pending blocks few
+                batch = num_workers * 4
+                for start in range(0, len(windows), batch):
+                    batch_windows = windows[start : start + batch]
+                    blocks = executor.map(merge_fn, batch_windows)
+                    for window, block in zip(batch_windows, blocks):
+                        dst.write(block, window=window)
+    finally:
+        # Close the opened files
+        for src in srcs:
+            src.close()
+
+    # Remove the source files if requested
+    if delete_after:
+        for file in files:
+            file.unlink()
+
+
+def _is_tif_file(path: Path) -> bool:
+    """
+    Check if the path is an existing .tif file with a single stat call.
+    """
+    if path.suffix != ".tif":
+        return False
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+# Source files and output profile of a merge worker process
+_PROCESS_MERGE: "tuple[list[rasterio.DatasetReader], dict] | None" = None
+
+
+def _init_merge_process(files: list[Path], profile: dict) -> None:
+    """
+    Open the source files once in a merge worker process.
+    """
+    import rasterio
+
+    global _PROCESS_MERGE
+    srcs = [rasterio.open(file) for file in files]
+    _PROCESS_MERGE = (srcs, profile)
+
+
+def _merge_window_in_process(window: "Window") -> np.ndarray:
+    """
+    Merge a window of the output file in a merge worker process.
+    """
+    srcs, profile = _PROCESS_MERGE
+    return _merge_window(srcs, profile, window)
+
+
+def _merge_window(
+    srcs: "list[rasterio.DatasetReader]",
+    profile: dict,
+    window: "Window",
+    locks: list[threading.Lock] | None = None,
+) -> np.ndarray:
+    """
+    Merge the source files within a window of the output file.
+    Overlapping pixels are taken from the first source file (as rasterio.merge does).
+
+    Parameters
+    ----------
+    srcs:
+        Opened source files.
+    profile:
+        Profile of the output file.
+    window:
+        Window of the output file to merge.
+    locks:
+        Optional locks held while reading each source file, when the files are shared by threads.
+
+    Returns
+    -------
+    np.ndarray:
+        Merged array of shape (bands, height, width).
+    """
+    from rasterio.windows import bounds as window_bounds
+    from rasterio.windows import from_bounds
+
+    transform = profile["transform"]
+    shape = (profile["count"], window.height, window.width)
+    # Pixels not covered by any source file are filled with nodata (or 0 if unset)
+    fill = profile["nodata"] if profile["nodata"] is not None else 0
+    merged = np.full(shape, fill, dtype=profile["dtype"])
+    filled = np.zeros(shape, dtype=bool)
+    left, bottom, right, top = window_bounds(window, transform)
+
+    for index, src in enumerate(srcs):
+        # Intersection of the window and the source file
+        bounds = (
+            max(left, src.bounds.left),
+            max(bottom, src.bounds.bottom),
+            min(right, src.bounds.right),
+            min(top, src.bounds.top),
+        )
+        if bounds[0] >= bounds[2] or bounds[1] >= bounds[3]:
+            continue
+
+        # Pixels of the intersection in the merged array
+        part = from_bounds(*bounds, transform=transform).round_lengths()
+        part = part.round_offsets()
+        row, col = part.row_off - window.row_off, part.col_off - window.col_off
+        if part.height == 0 or part.width == 0:
+            continue
+
+        with locks[index] if locks else nullcontext():
+            data = src.read(
+                window=from_bounds(*bounds, transform=src.transform),
+                out_shape=(src.count, part.height, part.width),
+                masked=True,
+            )
+        target = (
+            slice(None),
+            slice(row, row + part.height),
+            slice(col, col + part.width),
+        )
+        update = ~np.ma.getmaskarray(data) & ~filled[target]
+        merged[target][update] = data.data[update]
+        filled[target] |= update
+
+    return merged
+
+
+def stack_tif_files(
+    files: list[str | Path], output_path: str | Path, delete_after: bool = False
+) -> None:
+    """
+    Stack the bands of .tif files sharing the same pixel grid into a single .tif file.
+    Bands are copied block by block, so the files are never fully loaded in memory.
+
+    Parameters
+    ----------
+    files:
+        List of paths to the .tif files to stack.
+    output_path:
+        Path to the output .tif file.
+    delete_after:
+        Whether to delete the source files after stacking.
+    """
+    import rasterio
+
+    files = [Path(file) for file in files]
+    assert len(files) > 0, "No files to stack."
+
+    srcs = [rasterio.open(file) for file in files]
+    profile: dict = srcs[0].profile
+    profile.update({"driver": "GTiff", "count": sum(src.count for src in srcs)})
+
+    # Copy the bands of each file into consecutive bands of the output file
     with rasterio.open(output_path, "w", **profile) as dst:
-        dst.write(merged)
+        index = 1
+        for src in srcs:
+            indexes = list(range(index, index + src.count))
+            for _, window in src.block_windows(1):
+                dst.write(src.read(window=window), indexes=indexes, window=window)
+            index += src.count
+        dst.descriptions = tuple(desc for src in srcs for desc in src.descriptions)
 
     # Close the opened files
     for src in srcs:
@@ -117,48 +358,258 @@ def merge_tif_files(
             file.unlink()
 
 
-def quantize_numpy(image: np.ndarray) -> np.ndarray:
+def convert_to_cog(
+    path: str | Path,
+    compress: str = "DEFLATE",
+    predictor: int | None = None,
+    blocksize: int = 512,
+) -> None:
+    """
+    Convert a GeoTIFF file into a Cloud-Optimized GeoTIFF in place.
+    Internal tiling and predictor compression make windowed reads cheaper
+    and shrink the smooth embedding rasters on disk.
+
+    Parameters
+    ----------
+    path:
+        Path to the .tif file.
+    compress:
+        Compression method of the output file.
+    predictor:
+        TIFF predictor (1: none, 2: horizontal, 3: floating point).
+        If None, the predictor is chosen from the data type.
+    blocksize:
+        Size of the internal tiles in pixels.
+    """
+    from rasterio.shutil import copy as rio_copy
+
+    path = Path(path)
+    tmp_path = path.with_suffix(".cog.tmp")
+
+    # Automatic predictor is horizontal (integer) or floating point depending on the dtype
+    predictors = {None: "YES", 1: "NO", 2: "STANDARD", 3: "FLOATING_POINT"}
+    rio_copy(
+        path,
+        tmp_path,
+        driver="COG",
+        COMPRESS=compress,
+        PREDICTOR=predictors[predictor],
+        BLOCKSIZE=blocksize,
+        OVERVIEWS="NONE",
+    )
+    tmp_path.replace(path)
+
+
+def quantize_numpy(
+    image: np.ndarray,
+    out: np.ndarray | None = None,
+    scratch: np.ndarray | None = None,
+) -> np.ndarray:
     """
     Quantize an AlphaEarth embedding image with uint8 dtype.
+
+    Parameters
+    ----------
+    image:
+        The embedding image to quantize.
+    out:
+        An optional contiguous uint8 array with the image shape to write the result into.
+    scratch:
+        An optional float32 buffer reused for the intermediate values,
+        so repeated calls do not allocate. Its size sets the block size.
+    """
+    image = np.asarray(image)
+    output = _check_output(out, image.shape, np.uint8)
+
+    # Quantize block by block in a reusable float32 buffer,
+    # so no full-size temporary arrays are allocated
+    flat_image, flat_output = image.reshape(-1), output.reshape(-1)
+    if scratch is None:
+        buffer = np.empty(max(min(flat_image.size, _BLOCK_SIZE), 1), dtype=np.float32)
+    elif scratch.dtype != np.float32 or scratch.size == 0:
+        raise ValueError("Scratch buffer must be a non-empty float32 array.")
+    else:
+        buffer = scratch.reshape(-1)
+    block_size = buffer.size
+    for start in range(0, flat_image.size, block_size):
+        block = flat_image[start : start + block_size]
+        values = buffer[: block.size]
+        np.abs(block, out=values)
+        np.sqrt(values, out=values)
+        np.multiply(values, 127.5, out=values)
+        # Clamping the magnitude before applying the sign is a single comparison
+        np.minimum(values, 127, out=values)
+        # Copy the sign bit of the input instead of computing and multiplying its sign
+        np.copysign(values, block, out=values)
+        # Shift and cast in one pass, straight into the output
+        np.add(
+            values, 128, out=flat_output[start : start + block.size], casting="unsafe"
+        )
+
+    return output
+
+
+def quantize_batch(
+    images: np.ndarray,
+    out: np.ndarray | None = None,
+    num_workers: int | None = None,
+) -> np.ndarray:
+    """
+    Quantize a batch of AlphaEarth embedding images stacked along the first axis
+    (e.g. a time series) with uint8 dtype.
+
+    Parameters
+    ----------
+    images:
+        The embedding images to quantize, stacked along the first axis.
+    out:
+        An optional contiguous uint8 array with the images shape to write the result into.
+    num_workers:
+        Number of threads to quantize the images with (NumPy releases the GIL),
+        defaults to the number of CPUs.
+    """
+    images = np.asarray(images)
+    assert images.ndim >= 2, "Images must be stacked along the first axis."
+    output = _check_output(out, images.shape, np.uint8)
+
+    # Every thread quantizes whole images into the output with its own scratch buffer
+    local = threading.local()
+
+    def quantize_image(index: int) -> None:
+        if not hasattr(local, "scratch"):
+            local.scratch = np.empty(_BLOCK_SIZE, dtype=np.float32)
+        quantize_numpy(images[index], out=output[index], scratch=local.scratch)
+
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(images) <= 1:
+        for index in range(len(images)):
+            quantize_image(index)
+    else:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            list(executor.map(quantize_image, range(len(images))))
+
+    return output
+
+
+def _check_output(
+    out: np.ndarray | None, shape: tuple[int, ...], dtype: np.dtype
+) -> np.ndarray:
     """
-    image = np.abs(image) ** (1 / 2.0) * np.sign(image)
-    image = (np.clip(image * 127.5, -127, 127) + 128).astype(np.uint8)
-    return image
+    Check a caller-provided output array, or allocate a new one.
+    """
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape or out.dtype != dtype or not out.flags.c_contiguous:
+        raise ValueError(
+            f"Output array must be a C-contiguous {np.dtype(dtype)} array with shape {shape}."
+        )
+    return out
 
 
-def quantize_ee(image: ee.Image) -> ee.Image:
+@lru_cache
+def _get_dequantize_lut(dtype: np.dtype) -> np.ndarray:
+    """
+    Get the dequantization lookup table in the given dtype.
+    """
+    return _DEQUANTIZE_LUT.astype(dtype)
+
+
+def quantize_ee(image: "ee.Image") -> "ee.Image":
     """
     Quantize an AlphaEarth embedding image with uint8 dtype.
     """
-    image = image.abs().pow(1 / 2.0).multiply(image.signum())
-    image = image.multiply(127.5).clamp(-127, 127).add(128).uint8()
-    return image
+    # Single expression to keep the computation graph small
+    expression = "uint8(clamp(signum(b) * sqrt(abs(b)) * 127.5, -127, 127) + 128)"
+    return image.expression(expression, {"b": image}).rename(image.bandNames())
+
+
+def convert_dtype_numpy(image: np.ndarray, dtype: np.dtype | str) -> np.ndarray:
+    """
+    Convert an AlphaEarth embedding image to the given dtype (uint8, int8 or float32).
+    Local counterpart of the conversion applied by the downloader on Earth Engine.
+    """
+    try:
+        dtype = np.dtype(dtype).name
+    except TypeError:
+        raise ValueError(f"Invalid dtype: {dtype}") from None
 
+    if dtype == "uint8":
+        return quantize_numpy(image)
+    elif dtype == "int8":
+        # Linear quantization, divide by 127 to restore the embeddings
+        # (rounded and clipped in place to avoid temporary arrays)
+        scaled = np.multiply(image, 127, dtype=np.float32)
+        np.rint(scaled, out=scaled)
+        np.clip(scaled, -127, 127, out=scaled)
+        return scaled.astype(np.int8)
+    elif dtype == "float32":
+        return image.astype(np.float32, copy=False)
+    else:
+        raise ValueError(f"Invalid dtype: {dtype}")
 
-def dequantize_numpy(image: np.ndarray) -> np.ndarray:
+
+def dequantize_numpy(
+    image: np.ndarray,
+    dtype: np.dtype | str = np.float32,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
     """
     Dequantize an AlphaEarth embedding image with uint8 dtype.
+
+    Parameters
+    ----------
+    image:
+        The quantized embedding image.
+    dtype:
+        The output dtype, any float dtype including "bfloat16" (requires ml_dtypes).
+    out:
+        An optional contiguous array with the image shape and output dtype to write the result into.
     """
-    image = (image.astype(np.float32) - 128) / 127.5
-    image = (np.abs(image) ** 2.0) * np.sign(image)
-    return image
+    if isinstance(dtype, str) and dtype == "bfloat16":
+        # ml_dtypes is an optional dependency, only needed for bfloat16 output
+        import ml_dtypes
+
+        dtype = ml_dtypes.bfloat16
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        raise ValueError(f"Invalid dtype: {dtype}") from None
+    if dtype.kind != "f" and dtype.name != "bfloat16":
+        raise ValueError(f"Invalid dtype: {dtype} (must be a float dtype)")
+    lut = _get_dequantize_lut(dtype)
+
+    image = np.asarray(image, dtype=np.uint8)
+    output = _check_output(out, image.shape, lut.dtype)
+
+    # Every uint8 value has a single embedding value, so dequantization is a lookup
+    # (done block by block, so the converted indices stay small)
+    flat_image, flat_output = image.reshape(-1), output.reshape(-1)
+    for start in range(0, flat_image.size, _BLOCK_SIZE):
+        end = start + _BLOCK_SIZE
+        np.take(lut, flat_image[start:end], out=flat_output[start:end])
+
+    return output
 
 
-def dequantize_ee(image: ee.Image) -> ee.Image:
+def dequantize_ee(image: "ee.Image") -> "ee.Image":
     """
     Dequantize an AlphaEarth embedding image with uint8 dtype.
     """
-    image = image.float().subtract(128).divide(127.5)
-    image = image.abs().pow(2.0).multiply(image.signum())
-    return image
+    # Single expression to keep the computation graph small, squaring as x * |x| keeps the sign
+    expression = "((float(b) - 128) / 127.5) * abs((float(b) - 128) / 127.5)"
+    return image.expression(expression, {"b": image}).rename(image.bandNames())
 
 
 __all__ = [
     "is_notebook",
     "merge_tif_directory",
     "merge_tif_files",
+    "stack_tif_files",
+    "convert_to_cog",
     "quantize_numpy",
+    "quantize_batch",
     "quantize_ee",
+    "convert_dtype_numpy",
     "dequantize_numpy",
     "dequantize_ee",
 ]
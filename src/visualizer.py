@@ -1,16 +1,19 @@
 # Copyright (c) kerem.ai. All Rights Reserved.
 
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Literal
+from typing import TYPE_CHECKING, Callable, Literal
 
 import ee
-import geemap
-import geopandas as gpd
-import rasterio
 
 from .earthengine import EarthEngine
 from .utils import is_notebook
 
+if TYPE_CHECKING:
+    # geemap, geopandas and rasterio are heavy, so they are imported where they are used
+    import geopandas as gpd
+
 
 class EarthEngineVisualizer(EarthEngine):
     """
@@ -45,6 +48,8 @@ class EarthEngineVisualizer(EarthEngine):
         """
         Reset the map to the default state.
         """
+        import geemap
+
         self.map: geemap.Map = geemap.Map()
         self.map.add_basemap(self.basemap)
 
@@ -102,9 +107,9 @@ class EarthEngineVisualizer(EarthEngine):
         opacity:
             Opacity of the layer.
         """
-        with rasterio.open(path, "r") as src:
-            nodata = src.nodata
-            count = src.count
+        # Remote files have no modification time, they are cached by path only
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        nodata, count = _get_tif_meta(str(path), mtime)
 
         bands = bands or list(range(count))
         assert (
@@ -126,7 +131,7 @@ class EarthEngineVisualizer(EarthEngine):
 
     def plot_gdf(
         self,
-        gdf: gpd.GeoDataFrame,
+        gdf: "gpd.GeoDataFrame",
         name: str,
         style: dict = {},
         hover_style: dict = {},
@@ -272,3 +277,15 @@ class EarthEngineVisualizer(EarthEngine):
         assert path.suffix == ".html", "Path must end with .html."
         print(f"Saving map to {path}...")
         self.map.to_html(path)
+
+
+@lru_cache(maxsize=256)
+def _get_tif_meta(path: str, mtime: float | None) -> tuple[float | None, int]:
+    """
+    Get the nodata value and the band count of a GeoTIFF file.
+    The modification time is part of the cache key, so rewritten files are read again.
+    """
+    import rasterio
+
+    with rasterio.open(path, "r") as src:
+        return src.nodata, src.count